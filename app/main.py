@@ -1,14 +1,64 @@
+import asyncio
+import csv
+import hashlib
+import heapq
+import io
+import itertools
+import json
+import logging
 import os
-from typing import List, Optional, Dict, Any, Tuple
+import re
+import time
+from collections import OrderedDict, deque
+from math import radians, sin, cos, sqrt, asin
+from typing import List, Optional, Dict, Any, FrozenSet, Set, Tuple
 import secrets
-
-from fastapi import FastAPI, HTTPException, Query, Body, Depends, status
+from contextlib import asynccontextmanager
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # vectorized radius filter falls back to the scalar loop
+
+# orjson-backed responses when available (serialization is CPU-bound on the
+# larger search payloads); plain JSONResponse otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# async-aware memoization for the pure text -> coordinates geocoding lookup;
+# the manual dict cache below remains as the fallback
+try:
+    from async_lru import alru_cache
+except ImportError:
+    alru_cache = None
+
+# Optional shared cache backend: set REDIS_URL to share search-cache hits
+# across uvicorn workers and restarts; without it the in-process cache is used
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:
+    redis_asyncio = None
+
+# HTTP/2 support needs the optional h2 extra (httpx[http2]); degrade to
+# HTTP/1.1 keepalive when it isn't installed
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+from fastapi import FastAPI, HTTPException, Query, Body, Depends, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi.responses import StreamingResponse, JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
+import httpx
 
 from app.services.places_client import PlacesClient, Center
 from app.models.schemas import (
@@ -16,8 +66,15 @@ from app.models.schemas import (
     SearchResponse,
     PlaceLite,
 )
-from app.utils.categories import load_category_packs, CategoryPack
+from app.utils.categories import load_category_packs, build_type_index, CategoryPack, DEFAULT_CATEGORIES_PATH
 from app.utils.filters import apply_residential_filter
+from app.utils.distance import (
+    fused_radius_mask,
+    kdtree_radius_mask,
+    numpy_radius_mask,
+    FUSED_MIN_POINTS,
+    KDTREE_MIN_POINTS,
+)
 
 load_dotenv()
 
@@ -44,13 +101,20 @@ def verify_credentials(credentials: HTTPBasicCredentials = Depends(security)):
 
 def _haversine_meters(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Great-circle distance between two points on Earth in meters."""
-    from math import radians, sin, cos, sqrt, atan2
+    # asin form: one sqrt and one trig call fewer than the atan2 variant
     R = 6371000.0
     dlat = radians(lat2 - lat1)
     dlon = radians(lon2 - lon1)
     a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-    return R * c
+    return 2 * R * asin(sqrt(a))
+
+
+# Precompiled pieces for _parse_address_parts (hot in CSV export, once per row)
+# Fast path matches the canonical "street, city, ST 12345[-6789]" shape Google
+# emits for nearly all US addresses in one pass, no intermediate lists
+_ADDR_FULL_RE = re.compile(r"^([^,]+),\s*([^,]+),\s*([A-Z]{2})\s+(\d{5})(?:-\d{4})?")
+_ADDR_STATE_ZIP_RE = re.compile(r"([A-Z]{2})\s*,?\s*(\d{5})(?:-\d{4})?", re.I)
+_COUNTRY_SET = frozenset({"USA", "US", "UNITED STATES"})
 
 
 def _parse_address_parts(addr: str) -> Dict[str, str]:
@@ -58,18 +122,25 @@ def _parse_address_parts(addr: str) -> Dict[str, str]:
     out = {"street": "", "city": "", "state": "", "zip": ""}
     if not addr:
         return out
+    m = _ADDR_FULL_RE.match(addr)
+    if m:
+        street, city, state, zip_code = m.groups()
+        out["street"] = street.strip()
+        out["city"] = city.strip()
+        out["state"] = state
+        out["zip"] = zip_code
+        return out
     parts = [p.strip() for p in addr.split(",") if p.strip()]
     if len(parts) >= 2:
         last = parts[-1]
         # Drop trailing country like 'USA' or 'United States'
-        if last.upper() in {"USA", "US", "UNITED STATES"} or (last.isalpha() and len(last) > 2):
+        if last.upper() in _COUNTRY_SET or (last.isalpha() and len(last) > 2):
             parts = parts[:-1]
     if len(parts) >= 3:
         out["street"] = ", ".join(parts[:-2])
         out["city"] = parts[-2]
         last = parts[-1]
-        import re
-        m = re.search(r"([A-Z]{2})\s*,?\s*(\d{5})(?:-\d{4})?", last, flags=re.I)
+        m = _ADDR_STATE_ZIP_RE.search(last)
         if m:
             out["state"] = m.group(1).upper()
             out["zip"] = m.group(2)
@@ -84,7 +155,48 @@ def _parse_address_parts(addr: str) -> Dict[str, str]:
         out["street"] = addr
     return out
 
-app = FastAPI(title="Fleet Prospect Finder - MVP (Places API)")
+# Shared Places client, created for the app lifetime by the lifespan handler
+PLACES_CLIENT: Optional[PlacesClient] = None
+# Shared Redis connection for the search cache, when configured
+_REDIS = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One shared connection pool (keepalive, TLS session reuse) for every
+    # upstream Google call across the app lifetime. places.googleapis.com
+    # speaks HTTP/2, so the per-pack fan-out multiplexes over one connection
+    # instead of opening a TCP+TLS stream per concurrent request.
+    global PLACES_CLIENT, _REDIS
+    http = httpx.AsyncClient(
+        http2=_HTTP2_AVAILABLE,
+        timeout=httpx.Timeout(20.0, connect=5.0),
+        limits=httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=50,
+            keepalive_expiry=30,
+        ),
+    )
+    app.state.http = http
+    if PLACES_API_KEY:
+        PLACES_CLIENT = PlacesClient(api_key=PLACES_API_KEY, field_mask=FIELD_MASK, client=http)
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        if redis_asyncio is not None:
+            _REDIS = redis_asyncio.from_url(redis_url)
+        else:
+            logger.warning("REDIS_URL is set but the redis package is not installed; using the in-process cache")
+    yield
+    PLACES_CLIENT = None
+    await http.aclose()
+    if _REDIS is not None:
+        await _REDIS.aclose()
+        _REDIS = None
+
+app = FastAPI(
+    title="Fleet Prospect Finder - MVP (Places API)",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
+)
 
 # CORS for local dev and typical ports
 app.add_middleware(
@@ -100,15 +212,52 @@ if not PLACES_API_KEY:
     # Don't crash app; raise on first use instead to make DX smooth
     pass
 
-# Load category taxonomy with a simple reload helper so JSON edits don't require server restart
+# Load category taxonomy with a simple reload helper so JSON edits don't require
+# server restart; the reload is mtime-gated so hot paths only pay an os.stat,
+# not a JSON parse, per request
 CATEGORY_PACKS = load_category_packs()
 CATEGORY_PACKS_BY_KEY: Dict[str, CategoryPack] = {p.key: p for p in CATEGORY_PACKS}
+TYPE_TO_PACK: Dict[str, CategoryPack] = build_type_index(CATEGORY_PACKS)
+_CATEGORIES_MTIME: Optional[float] = None
+try:
+    _CATEGORIES_MTIME = os.stat(DEFAULT_CATEGORIES_PATH).st_mtime
+except OSError:
+    pass
 
 def reload_categories() -> None:
-    global CATEGORY_PACKS, CATEGORY_PACKS_BY_KEY
+    global CATEGORY_PACKS, CATEGORY_PACKS_BY_KEY, TYPE_TO_PACK, _CATEGORIES_MTIME
+    try:
+        mtime = os.stat(DEFAULT_CATEGORIES_PATH).st_mtime
+    except OSError:
+        return
+    if mtime == _CATEGORIES_MTIME:
+        return
     packs = load_category_packs()
     CATEGORY_PACKS = packs
     CATEGORY_PACKS_BY_KEY = {p.key: p for p in packs}
+    TYPE_TO_PACK = build_type_index(packs)
+    _CATEGORIES_MTIME = mtime
+
+# Auto-repair packs that qualify for the high-recall boost search, and its
+# constant text query
+AUTO_RECALL_KEYS = {
+    "auto_traditional",  # general auto repair
+    "quick_lube",
+    "tire_shops",
+    "auto_glass",
+    "body_collision",
+}
+BOOST_QUERY = " OR ".join([
+    "auto repair",
+    "mechanic",
+    "brake repair",
+    "muffler",
+    "transmission repair",
+    "oil change",
+    "engine repair",
+    "tire service",
+    "alignment",
+])
 
 # Minimal field mask per PRD (plus pureServiceAreaBusiness when present)
 FIELD_MASK = (
@@ -125,28 +274,36 @@ FIELD_MASK = (
     "places.pureServiceAreaBusiness"
 )
 
-# In-memory cache for search responses (20 minute TTL)
+# In-memory cache for search responses (20 minute TTL): a bounded LRU plus a
+# min-heap of expiry times so pruning is amortized O(log k) instead of a full
+# scan. The entry cap is env-tunable for small deployments.
 _CACHE_TTL_SECONDS = 20 * 60
-_SEARCH_CACHE: Dict[Tuple[float, float, int, Tuple[str, ...], bool], Tuple[float, Dict[str, Any]]] = {}
+_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024"))
+CacheKey = Tuple[float, float, int, FrozenSet[str], bool]
+_SEARCH_CACHE: "OrderedDict[CacheKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_CACHE_EXPIRY_HEAP: List[Tuple[float, int, CacheKey]] = []
+_CACHE_HEAP_SEQ = itertools.count()  # tiebreaker so heap never compares keys
 
-def _build_cache_key(center_lat: float, center_lng: float, radius_meters: int, categories: List[str], high_recall: bool) -> Tuple[float, float, int, Tuple[str, ...], bool]:
+def _build_cache_key(center_lat: float, center_lng: float, radius_meters: int, categories: List[str], high_recall: bool) -> CacheKey:
     # Round lat/lng to avoid overly granular keys; 5 decimals ~1.1 meters
     lat_r = round(center_lat, 5)
     lng_r = round(center_lng, 5)
-    cats = tuple(sorted(categories or []))
+    # frozenset is order-independent and hashable without the O(k log k) sort
+    cats = frozenset(categories or ())
     return (lat_r, lng_r, int(radius_meters), cats, bool(high_recall))
 
-def _cache_get(key: Tuple[float, float, int, Tuple[str, ...], bool]) -> Optional[Dict[str, Any]]:
-    import time
-    now = time.time()
-    # Opportunistic prune and fetch
-    stale: List[Tuple] = []
-    if _SEARCH_CACHE:
-        for k, (ts, _val) in list(_SEARCH_CACHE.items()):
-            if now - ts > _CACHE_TTL_SECONDS:
-                stale.append(k)
-    for k in stale:
-        _SEARCH_CACHE.pop(k, None)
+def _redis_key(key: CacheKey) -> str:
+    lat_r, lng_r, radius_m, cats, high_recall = key
+    return f"search:{lat_r}:{lng_r}:{radius_m}:{','.join(sorted(cats))}:{int(high_recall)}"
+
+def _local_cache_get(key: CacheKey) -> Optional[Dict[str, Any]]:
+    now = time.monotonic()
+    # Pop expired entries off the heap; skip keys that were refreshed after their push
+    while _CACHE_EXPIRY_HEAP and _CACHE_EXPIRY_HEAP[0][0] <= now:
+        _exp, _seq, k = heapq.heappop(_CACHE_EXPIRY_HEAP)
+        entry = _SEARCH_CACHE.get(k)
+        if entry is not None and now - entry[0] > _CACHE_TTL_SECONDS:
+            _SEARCH_CACHE.pop(k, None)
     entry = _SEARCH_CACHE.get(key)
     if not entry:
         return None
@@ -154,11 +311,183 @@ def _cache_get(key: Tuple[float, float, int, Tuple[str, ...], bool]) -> Optional
     if now - ts > _CACHE_TTL_SECONDS:
         _SEARCH_CACHE.pop(key, None)
         return None
+    _SEARCH_CACHE.move_to_end(key)
     return val
 
-def _cache_set(key: Tuple[float, float, int, Tuple[str, ...], bool], value: Dict[str, Any]) -> None:
-    import time
-    _SEARCH_CACHE[key] = (time.time(), value)
+def _local_cache_set(key: CacheKey, value: Dict[str, Any]) -> None:
+    now = time.monotonic()
+    _SEARCH_CACHE[key] = (now, value)
+    _SEARCH_CACHE.move_to_end(key)
+    heapq.heappush(_CACHE_EXPIRY_HEAP, (now + _CACHE_TTL_SECONDS, next(_CACHE_HEAP_SEQ), key))
+    while len(_SEARCH_CACHE) > _CACHE_MAX_ENTRIES:
+        _SEARCH_CACHE.popitem(last=False)
+
+async def _cache_get(key: CacheKey) -> Optional[Dict[str, Any]]:
+    if _REDIS is not None:
+        try:
+            raw = await _REDIS.get(_redis_key(key))
+        except Exception as e:
+            logger.warning("Redis get failed, using in-process cache: %s", e)
+        else:
+            if raw is not None:
+                return json.loads(raw)
+    return _local_cache_get(key)
+
+async def _cache_set(key: CacheKey, value: Dict[str, Any]) -> None:
+    _local_cache_set(key, value)
+    if _REDIS is not None:
+        try:
+            payload = json.dumps({
+                "results": [r.model_dump() if isinstance(r, PlaceLite) else r for r in value.get("results", [])],
+                "nextPageToken": value.get("nextPageToken"),
+            })
+            await _REDIS.setex(_redis_key(key), _CACHE_TTL_SECONDS, payload)
+        except Exception as e:
+            logger.warning("Redis set failed, entry kept only in-process: %s", e)
+
+# Geocoding cache for text centers (1 hour TTL, FIFO eviction): resolving e.g.
+# "Austin, TX" costs an upstream round-trip before the search fan-out can start
+_GEO_CACHE_TTL_SECONDS = 60 * 60
+_GEO_CACHE_MAX_ENTRIES = 512
+_GEO_CACHE: "OrderedDict[str, Tuple[float, float, float]]" = OrderedDict()  # text -> (lat, lng, ts)
+
+if alru_cache is not None:
+    @alru_cache(maxsize=_GEO_CACHE_MAX_ENTRIES, ttl=_GEO_CACHE_TTL_SECONDS)
+    async def _geocode_text_cached(text_key: str) -> Tuple[float, float]:
+        geo = await get_places_client().resolve_center(Center(text=text_key))
+        return geo["latitude"], geo["longitude"]
+
+async def _resolve_center_cached(client: PlacesClient, center: Center) -> Tuple[float, float]:
+    if center.text:
+        key = center.text.strip().lower()
+        if alru_cache is not None:
+            return await _geocode_text_cached(key)
+        now = time.monotonic()
+        hit = _GEO_CACHE.get(key)
+        if hit is not None and now - hit[2] <= _GEO_CACHE_TTL_SECONDS:
+            return hit[0], hit[1]
+        geo = await client.resolve_center(center)
+        lat, lng = geo["latitude"], geo["longitude"]
+        _GEO_CACHE[key] = (lat, lng, now)
+        while len(_GEO_CACHE) > _GEO_CACHE_MAX_ENTRIES:
+            _GEO_CACHE.popitem(last=False)
+        return lat, lng
+    geo = await client.resolve_center(center)
+    return geo["latitude"], geo["longitude"]
+
+def get_places_client() -> PlacesClient:
+    if PLACES_CLIENT is None:
+        raise HTTPException(status_code=500, detail="PLACES_API_KEY not configured")
+    return PLACES_CLIENT
+
+def _merge_result(r: PlaceLite, label: Optional[str], by_id: Dict[str, PlaceLite], cat_sets: Dict[str, Set[str]]) -> None:
+    """Merge one upstream result into the accumulator, tagging it with the pack label.
+
+    cat_sets mirrors each result's categories as a set so the membership check
+    is O(1); categories itself stays an ordered list for responses.
+    """
+    existing = by_id.get(r.placeId)
+    if existing is None:
+        r.categories = [label] if label else []
+        by_id[r.placeId] = r
+        cat_sets[r.placeId] = {label} if label else set()
+    elif label and label not in cat_sets[r.placeId]:
+        cat_sets[r.placeId].add(label)
+        existing.categories.append(label)
+
+def _postprocess_results(
+    merged_list: List[PlaceLite],
+    nearby_verified: Set[str],
+    center_lat: float,
+    center_lng: float,
+    radius_m: int,
+    max_results: int,
+    exclude_service_area_only: bool,
+) -> List[PlaceLite]:
+    """Strict radius enforcement, nearest-first ordering, residential filter, truncate.
+
+    Synchronous on purpose: callers run it via asyncio.to_thread to keep the
+    event loop free during the CPU-bound pass.
+    """
+    in_radius: List[PlaceLite] = []
+    if np is not None and merged_list:
+        # One-point-to-many distance: batch all coords and compute haversine in a few ufunc calls
+        n = len(merged_list)
+        nan = float("nan")
+        lats = np.fromiter((r.lat if r.lat is not None else nan for r in merged_list), dtype=np.float64, count=n)
+        lngs = np.fromiter((r.lng if r.lng is not None else nan for r in merged_list), dtype=np.float64, count=n)
+        # Strict enforcement: results without coordinates are dropped
+        have = ~np.isnan(lats) & ~np.isnan(lngs)
+        fused = None
+        if n > FUSED_MIN_POINTS:
+            # Optional Numba fast path: one fused pass, no intermediate arrays.
+            # Missing coords get a far-away sentinel so the kernel stays NaN-free.
+            fused = fused_radius_mask(
+                np.where(have, lats, 1e9), np.where(have, lngs, 1e9),
+                center_lat, center_lng, radius_m,
+            )
+        if fused is None and n > KDTREE_MIN_POINTS:
+            # Very large candidate sets: answer the radius question with a
+            # KD-tree ball query instead of trig over every point
+            fused = kdtree_radius_mask(
+                np.where(have, lats, 1e9), np.where(have, lngs, 1e9),
+                center_lat, center_lng, radius_m,
+            )
+        if fused is not None:
+            keep, dists = fused
+            keep &= have
+        else:
+            keep, dists = numpy_radius_mask(lats, lngs, center_lat, center_lng, radius_m)
+        # Nearby-verified results pass regardless of the computed distance (their
+        # radius was enforced upstream); any without a usable distance sort last
+        if nearby_verified:
+            keep |= np.fromiter((r.placeId in nearby_verified for r in merged_list), dtype=bool, count=n)
+        # Nearest-first ordering so downstream filtering can stop early
+        kept_idx = np.flatnonzero(keep)
+        kept_idx = kept_idx[np.argsort(dists[kept_idx], kind="stable")]
+        in_radius = [merged_list[i] for i in kept_idx.tolist()]
+    else:
+        # Inlined haversine kernel: the center terms are loop-invariant, so convert
+        # them to radians and take cos(center_lat) once instead of per point
+        center_lat_rad = radians(center_lat)
+        center_lng_rad = radians(center_lng)
+        cos_center = cos(center_lat_rad)
+        scored: List[Tuple[float, PlaceLite]] = []
+        for r in merged_list:
+            verified = r.placeId in nearby_verified
+            if r.lat is None or r.lng is None:
+                # Strict enforcement: drop if we cannot compute distance, unless
+                # the radius was already enforced upstream by Nearby Search
+                if verified:
+                    scored.append((float("inf"), r))
+                continue
+            lat_rad = radians(r.lat)
+            dlat = lat_rad - center_lat_rad
+            dlon = radians(r.lng) - center_lng_rad
+            a = sin(dlat / 2) ** 2 + cos_center * cos(lat_rad) * sin(dlon / 2) ** 2
+            d = 2 * 6371000.0 * asin(sqrt(a))
+            if verified or d <= radius_m:
+                scored.append((d, r))
+        scored.sort(key=lambda t: t[0])
+        in_radius = [r for _d, r in scored]
+
+    # Apply residential/home-based exclusion if requested (default True per PRD).
+    # The list is distance-sorted, so filter in chunks and stop once enough
+    # survivors are collected instead of scanning every in-radius result.
+    filtered: List[PlaceLite] = []
+    chunk = max(1, max_results * 2)
+    for start in range(0, len(in_radius), chunk):
+        filtered.extend(
+            apply_residential_filter(in_radius[start:start + chunk], exclude_service_area_only=exclude_service_area_only)
+        )
+        if len(filtered) >= max_results:
+            break
+
+    # Truncate to max_results
+    filtered = filtered[:max_results]
+
+    return filtered
+
 
 # Public health check (no auth required)
 @app.get("/health")
@@ -170,10 +499,7 @@ def health() -> Dict[str, str]:
 async def search_places(req: SearchRequest, username: str = Depends(verify_credentials)) -> SearchResponse:
     # Ensure latest taxonomy (no server restart required after editing data/categories.json)
     reload_categories()
-    if not PLACES_API_KEY:
-        raise HTTPException(status_code=500, detail="PLACES_API_KEY not configured")
-
-    client = PlacesClient(api_key=PLACES_API_KEY, field_mask=FIELD_MASK)
+    client = get_places_client()
 
     # Resolve center
     center: Center
@@ -186,14 +512,13 @@ async def search_places(req: SearchRequest, username: str = Depends(verify_crede
 
     # Resolve to numeric coordinates for strict radius filtering
     try:
-        center_geo = await client.resolve_center(center)
-        center_lat, center_lng = center_geo["latitude"], center_geo["longitude"]
+        center_lat, center_lng = await _resolve_center_cached(client, center)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to resolve center: {e}")
 
     # Cache lookup (keyed by resolved center, radius, packs, highRecall)
     cache_key = _build_cache_key(center_lat, center_lng, req.radiusMeters, req.categories, req.highRecall or False)
-    cached = _cache_get(cache_key)
+    cached = await _cache_get(cache_key)
     if cached is not None:
         # Compose response using cached payload
         return SearchResponse(
@@ -205,11 +530,21 @@ async def search_places(req: SearchRequest, username: str = Depends(verify_crede
 
     # Execute per selected category pack to tag results with pack labels
     results_by_id: Dict[str, PlaceLite] = {}
+    # Side-index of labels per placeId so membership checks are O(1) instead of
+    # scanning the categories list on every merge
+    category_sets: Dict[str, Set[str]] = {}
     # Store upstream pagination tokens together with their originating pack label
-    paginate_queue: List[tuple[str, str]] = []  # (next_page_token, pack_label)
+    # and source endpoint; deque so the round-robin popleft is O(1) rather than
+    # shifting the whole list
+    paginate_queue: "deque[tuple[str, str, Optional[str]]]" = deque()  # (next_page_token, pack_label, source)
 
     max_results = req.maxResults or 60
 
+    # Dispatch the Nearby + Text searches for every pack concurrently; the calls are
+    # independent up to merging, so wall time is roughly the slowest round-trip
+    # instead of the sum. Merging stays sequential in dispatch order so category
+    # tagging remains deterministic (pack order, nearby before text).
+    search_tasks: List[Tuple[str, str, "asyncio.Task"]] = []  # (pack_label, source, task)
     for key in req.categories:
         pack = CATEGORY_PACKS_BY_KEY.get(key)
         if not pack:
@@ -219,151 +554,150 @@ async def search_places(req: SearchRequest, username: str = Depends(verify_crede
 
         # Nearby: use pack's includedTypes if any
         if pack.includedTypes:
-            nearby_resp = await client.search_nearby(
+            search_tasks.append((pack_label, "nearby", asyncio.create_task(client.search_nearby(
                 center=center,
                 radius_meters=req.radiusMeters,
                 included_types=pack.includedTypes,
                 max_result_count=min(20, max_results),
-            )
-            for r in nearby_resp.results:
-                existing = results_by_id.get(r.placeId)
-                if existing:
-                    if pack_label not in (existing.categories or []):
-                        existing.categories.append(pack_label)
-                else:
-                    r.categories = [pack_label]
-                    results_by_id[r.placeId] = r
-            if nearby_resp.next_page_token:
-                paginate_queue.append((nearby_resp.next_page_token, pack_label))
-
-        # Text Search: use pack's keywords if any
+            ))))
+
+        # Text Search: use pack's precomputed keyword query if any
         if pack.keywords:
-            seg = " OR ".join(pack.keywords)
-            text_resp = await client.search_text(
-                text_query=seg,
+            search_tasks.append((pack_label, "text", asyncio.create_task(client.search_text(
+                text_query=pack.text_query,
                 center=center,
                 radius_meters=req.radiusMeters,
                 max_result_count=min(20, max_results),
-            )
-            for r in text_resp.results:
-                existing = results_by_id.get(r.placeId)
-                if existing:
-                    if pack_label not in (existing.categories or []):
-                        existing.categories.append(pack_label)
-                else:
-                    r.categories = [pack_label]
-                    results_by_id[r.placeId] = r
-            if text_resp.next_page_token:
-                paginate_queue.append((text_resp.next_page_token, pack_label))
+            ))))
+
+    outcomes: List[Any] = []
+    if search_tasks:
+        outcomes = await asyncio.gather(*(t for _label, _source, t in search_tasks), return_exceptions=True)
+        # One pack failing shouldn't sink the whole request; only bail out when
+        # every upstream search failed
+        if all(isinstance(o, BaseException) for o in outcomes):
+            raise HTTPException(status_code=502, detail=f"All upstream searches failed: {outcomes[0]}")
+
+    # Nearby Search enforces the radius upstream (locationRestriction), so only
+    # text-search results — which use a bias and can overflow the radius — need
+    # the strict local distance check
+    nearby_verified: Set[str] = set()
+
+    # Stop merging once we hold 2x max_results candidates (headroom for the radius
+    # and residential filters below) — anything past that is truncated anyway.
+    # High-recall keeps merging for maximum coverage.
+    merge_cap = None if req.highRecall else max_results * 2
+
+    for (pack_label, source, _task), part in zip(search_tasks, outcomes):
+        if isinstance(part, BaseException):
+            continue
+        if source == "nearby":
+            nearby_verified.update(r.placeId for r in part.results)
+        if merge_cap is not None and len(results_by_id) >= merge_cap:
+            break
+        for r in part.results:
+            if merge_cap is not None and len(results_by_id) >= merge_cap:
+                break
+            _merge_result(r, pack_label, results_by_id, category_sets)
+        if part.next_page_token:
+            paginate_queue.append((part.next_page_token, pack_label, part.source))
 
     # Recall boost: If auto-repair related packs are selected and highRecall is on, run an extra targeted text search and merge
     try:
-        AUTO_RECALL_KEYS = {
-            "auto_traditional",  # general auto repair
-            "quick_lube",
-            "tire_shops",
-            "auto_glass",
-            "body_collision",
-        }
         if req.highRecall and any(k in AUTO_RECALL_KEYS for k in req.categories):
-            boost_terms = [
-                "auto repair",
-                "mechanic",
-                "brake repair",
-                "muffler",
-                "transmission repair",
-                "oil change",
-                "engine repair",
-                "tire service",
-                "alignment",
-            ]
-            boost_query = " OR ".join(boost_terms)
             boost_resp = await client.search_text(
-                text_query=boost_query,
+                text_query=BOOST_QUERY,
                 center=center,
                 radius_meters=req.radiusMeters,
                 max_result_count=min(20, max_results),
             )
             for r in boost_resp.results:
-                existing = results_by_id.get(r.placeId)
-                if existing:
-                    # Tag with a generic category label if not already tagged
-                    if "TRADITIONAL AUTO" not in (existing.categories or []):
-                        existing.categories.append("TRADITIONAL AUTO")
-                else:
-                    r.categories = ["TRADITIONAL AUTO"]
-                    results_by_id[r.placeId] = r
+                # Tag with a generic category label if not already tagged
+                _merge_result(r, "TRADITIONAL AUTO", results_by_id, category_sets)
             if boost_resp.next_page_token:
-                paginate_queue.append((boost_resp.next_page_token, "TRADITIONAL AUTO"))
+                paginate_queue.append((boost_resp.next_page_token, "TRADITIONAL AUTO", boost_resp.source))
     except Exception:
         # Boost is best-effort; do not fail the request if it errors
         pass
 
-    # High-recall pagination: fetch additional pages round-robin across all queued next_page_tokens
+    # High-recall pagination: fetch additional pages in concurrent waves of queued
+    # next_page_tokens until max_results or tokens exhausted
     if req.highRecall and paginate_queue:
         try:
-            # Round-robin until max_results or tokens exhausted
-            idx = 0
             while len(results_by_id) < max_results and paginate_queue:
-                token, label = paginate_queue.pop(0)
-                try:
-                    page = await client.fetch_next_page(next_page_token=token)
-                except Exception:
-                    continue
-                for r in page.results:
-                    existing = results_by_id.get(r.placeId)
-                    if existing:
-                        if label and label not in (existing.categories or []):
-                            existing.categories.append(label)
-                    else:
-                        r.categories = [label] if label else []
-                        results_by_id[r.placeId] = r
-                if page.next_page_token:
-                    paginate_queue.append((page.next_page_token, label))
-                idx = (idx + 1) % (len(paginate_queue) or 1)
+                wave: List[Tuple[str, str, Optional[str]]] = []
+                while paginate_queue and len(wave) < 8:
+                    wave.append(paginate_queue.popleft())
+                pages = await asyncio.gather(
+                    *(client.fetch_next_page(next_page_token=token, source=source) for token, _label, source in wave),
+                    return_exceptions=True,
+                )
+                for (token, label, _source), page in zip(wave, pages):
+                    if isinstance(page, BaseException):
+                        continue
+                    for r in page.results:
+                        _merge_result(r, label, results_by_id, category_sets)
+                    if page.next_page_token:
+                        paginate_queue.append((page.next_page_token, label, page.source))
         except Exception:
             # Don't fail the request if pagination fails
             pass
 
-    merged_list = list(results_by_id.values())
-
-    # Strict radius enforcement: drop any results outside radiusMeters from the resolved center
-    radius_m = max(1, req.radiusMeters)
-    in_radius: List[PlaceLite] = []
-    for r in merged_list:
-        if r.lat is None or r.lng is None:
-            # Strict enforcement: drop if we cannot compute distance
-            continue
-        d = _haversine_meters(center_lat, center_lng, r.lat, r.lng)
-        if d <= radius_m:
-            in_radius.append(r)
-
-    # Apply residential/home-based exclusion if requested (default True per PRD)
-    filtered = apply_residential_filter(in_radius, exclude_service_area_only=req.excludeServiceAreaOnly)
+    # Cross-tag via the reverse type -> pack index: a place found by one pack's
+    # search may carry a type belonging to another selected pack. Restrict the
+    # index to the selected packs once per request so the per-type check is a
+    # single dict lookup, and probe primaryType first — for most places it
+    # resolves the dominant pack before the types scan even starts.
+    selected_keys = set(req.categories)
+    selected_index = {t: pack for t, pack in TYPE_TO_PACK.items() if pack.key in selected_keys}
+    for pid, r in results_by_id.items():
+        tagged = category_sets[pid]
+        primary_pack = selected_index.get(r.primaryType) if r.primaryType else None
+        if primary_pack is not None and primary_pack.label not in tagged:
+            tagged.add(primary_pack.label)
+            r.categories.append(primary_pack.label)
+        for t in (r.types or ()):
+            pack = selected_index.get(t)
+            if pack is not None and pack.label not in tagged:
+                tagged.add(pack.label)
+                r.categories.append(pack.label)
 
-    # Truncate to max_results
-    filtered = filtered[:max_results]
+    merged_list = list(results_by_id.values())
 
+    # Radius + residential filtering is pure CPU (trig, Pydantic attribute
+    # walks); run it off the event loop so concurrent requests aren't blocked
+    # while a large merge is crunched
+    filtered = await asyncio.to_thread(
+        _postprocess_results,
+        merged_list,
+        nearby_verified,
+        center_lat,
+        center_lng,
+        max(1, req.radiusMeters),
+        max_results,
+        req.excludeServiceAreaOnly,
+    )
     # For compatibility, still expose the first available token if any
     next_token = paginate_queue[0][0] if paginate_queue else None
 
     resp = SearchResponse(results=filtered, nextPageToken=next_token, centerLat=center_lat, centerLng=center_lng)
 
     # Store in cache
-    _cache_set(cache_key, {"results": resp.results, "nextPageToken": resp.nextPageToken})
+    await _cache_set(cache_key, {"results": resp.results, "nextPageToken": resp.nextPageToken})
 
     return resp
 
 @app.get("/search/places/next", response_model=SearchResponse)
-async def search_places_next(token: str = Query(..., description="Upstream Places API nextPageToken"), username: str = Depends(verify_credentials)) -> SearchResponse:
+async def search_places_next(
+    token: str = Query(..., description="Upstream Places API nextPageToken"),
+    source: Optional[str] = Query(default=None, description="Endpoint that issued the token: nearby | text"),
+    username: str = Depends(verify_credentials),
+) -> SearchResponse:
     reload_categories()
-    if not PLACES_API_KEY:
-        raise HTTPException(status_code=500, detail="PLACES_API_KEY not configured")
-
-    client = PlacesClient(api_key=PLACES_API_KEY, field_mask=FIELD_MASK)
+    client = get_places_client()
 
     try:
-        resp = await client.fetch_next_page(next_page_token=token)
+        resp = await client.fetch_next_page(next_page_token=token, source=source)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -384,28 +718,8 @@ async def search_places_csv(
     username: str = Depends(verify_credentials)
 ):
     reload_categories()
-    import csv
-    import io
 
     resp = await search_places(req, username)
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow([
-        "placeId",
-        "name",
-        "street",
-        "city",
-        "state",
-        "zip",
-        "lat",
-        "lng",
-        "primaryType",
-        "categories",
-        "types",
-        "businessStatus",
-        "googleMapsUri",
-        "pureServiceAreaBusiness",
-    ])
     rows = resp.results
     # Optional filter by primaryType
     if filterPrimaryTypes:
@@ -418,50 +732,98 @@ async def search_places_csv(
                 values.append(v)
         allow = set(values)
         rows = [r for r in rows if (r.primaryType in allow)]
-    for r in rows:
-        ap = _parse_address_parts(r.formattedAddress or "")
+
+    # Stream rows in chunks instead of buffering the whole body: first byte goes
+    # out after the header row and peak memory stays one chunk deep. Rows are
+    # encoded once through the TextIOWrapper; yielding bytes means starlette
+    # doesn't re-encode each chunk.
+    async def generate_csv():
+        buf = io.BytesIO()
+        text = io.TextIOWrapper(buf, encoding="utf-8", newline="", write_through=True)
+        writer = csv.writer(text)
+
+        def drain() -> bytes:
+            data = buf.getvalue()
+            buf.seek(0)
+            buf.truncate(0)
+            return data
+
         writer.writerow([
-            r.placeId,
-            r.name,
-            ap.get("street", ""),
-            ap.get("city", ""),
-            ap.get("state", ""),
-            ap.get("zip", ""),
-            r.lat if r.lat is not None else "",
-            r.lng if r.lng is not None else "",
-            r.primaryType or "",
-            ";".join(r.categories or []),
-            ";".join(r.types or []),
-            r.businessStatus or "",
-            r.googleMapsUri or "",
-            r.pureServiceAreaBusiness if r.pureServiceAreaBusiness is not None else "",
+            "placeId",
+            "name",
+            "street",
+            "city",
+            "state",
+            "zip",
+            "lat",
+            "lng",
+            "primaryType",
+            "categories",
+            "types",
+            "businessStatus",
+            "googleMapsUri",
+            "pureServiceAreaBusiness",
         ])
+        yield drain()
+        for i, r in enumerate(rows, start=1):
+            ap = _parse_address_parts(r.formattedAddress or "")
+            writer.writerow([
+                r.placeId,
+                r.name,
+                ap.get("street", ""),
+                ap.get("city", ""),
+                ap.get("state", ""),
+                ap.get("zip", ""),
+                r.lat if r.lat is not None else "",
+                r.lng if r.lng is not None else "",
+                r.primaryType or "",
+                ";".join(r.categories or []),
+                ";".join(r.types or []),
+                r.businessStatus or "",
+                r.googleMapsUri or "",
+                r.pureServiceAreaBusiness if r.pureServiceAreaBusiness is not None else "",
+            ])
+            if i % 256 == 0:
+                yield drain()
+        tail = drain()
+        if tail:
+            yield tail
 
-    output.seek(0)
     headers = {"Content-Disposition": "attachment; filename=places_export.csv"}
-    return StreamingResponse(output, media_type="text/csv", headers=headers)
+    return StreamingResponse(generate_csv(), media_type="text/csv; charset=utf-8", headers=headers)
 
 # Place details enrichment - protected
 @app.post("/places/details")
 async def places_details(payload: Dict[str, Any], username: str = Depends(verify_credentials)) -> Dict[str, Any]:
-    if not PLACES_API_KEY:
-        raise HTTPException(status_code=500, detail="PLACES_API_KEY not configured")
+    client = get_places_client()
     ids = payload.get("placeIds") or []
     if not isinstance(ids, list) or not ids:
         raise HTTPException(status_code=400, detail="placeIds array required")
-    # Cap to 50 to limit cost/time
-    ids = ids[:50]
-    client = PlacesClient(api_key=PLACES_API_KEY, field_mask=FIELD_MASK)
+    # Dedupe (order-preserving, C-speed) so repeated IDs don't cost extra
+    # upstream calls, then cap to 50 to limit cost/time
+    ids = list(dict.fromkeys(ids))[:50]
+
+    # Each lookup is an independent HTTP round-trip; fetch them concurrently
+    # with a small semaphore so we don't hammer the upstream API
+    sem = asyncio.Semaphore(10)
+
+    async def fetch(pid: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        async with sem:
+            try:
+                return pid, await client.get_place_details(pid)
+            except Exception:
+                return pid, None
+
+    fetched = await asyncio.gather(*(fetch(pid) for pid in ids))
 
     out: Dict[str, Any] = {}
-    for pid in ids:
-        try:
-            data = await client.get_place_details(pid)
+    for pid, data in fetched:
+        if data is not None:
             out[pid] = {
                 "phone": data.get("nationalPhoneNumber") or data.get("internationalPhoneNumber"),
                 "website": data.get("websiteUri"),
             }
-        except Exception:
+        else:
             out[pid] = {"phone": None, "website": None}
     return {"details": out}
 
@@ -488,19 +850,41 @@ async def import_prospects(payload: Dict[str, Any], username: str = Depends(veri
 # Static frontend serving (app/web) - NO authentication required
 WEB_DIR = os.path.join(os.path.dirname(__file__), "web")
 if os.path.isdir(WEB_DIR):
-    #app.mount("/static", StaticFiles(directory=WEB_DIR), name="static")
+    app.mount("/static", StaticFiles(directory=WEB_DIR, html=True), name="static")
+
+# In-memory cache for the handful of frontend files: path -> (mtime, body, etag).
+# Serving from memory avoids the stat+open+read per authenticated GET; the mtime
+# check keeps edits picked up without a restart.
+_WEB_FILE_CACHE: Dict[str, Tuple[float, bytes, str]] = {}
+
+def _serve_cached_file(path: str, request: Request, media_type: str = "text/html") -> Optional[Response]:
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    cached = _WEB_FILE_CACHE.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, "rb") as f:
+            body = f.read()
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        cached = (mtime, body, etag)
+        _WEB_FILE_CACHE[path] = cached
+    _mtime, body, etag = cached
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type=media_type, headers={"ETag": etag, "Cache-Control": "public, max-age=300"})
 
 # Protected frontend routes
 @app.get("/")
-def serve_index(username: str = Depends(verify_credentials)):
-    index_path = os.path.join(WEB_DIR, "index.html")
-    if os.path.exists(index_path):
-        return FileResponse(index_path)
+def serve_index(request: Request, username: str = Depends(verify_credentials)):
+    resp = _serve_cached_file(os.path.join(WEB_DIR, "index.html"), request)
+    if resp is not None:
+        return resp
     return {"message": "Frontend not built. API is running."}
 
 @app.get("/crm")
-def serve_crm(username: str = Depends(verify_credentials)):
-    crm_path = os.path.join(WEB_DIR, "crm.html")
-    if os.path.exists(crm_path):
-        return FileResponse(crm_path)
+def serve_crm(request: Request, username: str = Depends(verify_credentials)):
+    resp = _serve_cached_file(os.path.join(WEB_DIR, "crm.html"), request)
+    if resp is not None:
+        return resp
     return {"message": "CRM interface not found"}
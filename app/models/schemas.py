@@ -52,3 +52,6 @@ class SearchResponse(BaseModel):
 class ClientSearchResponse(BaseModel):
     results: List[PlaceLite]
     next_page_token: Optional[str] = None
+    # Endpoint that produced next_page_token, so pagination can go straight
+    # back to it instead of probing both search endpoints
+    source: Optional[Literal["nearby", "text"]] = None
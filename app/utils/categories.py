@@ -5,6 +5,11 @@ import os
 from typing import List, Optional
 from pydantic import BaseModel
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class CategoryPack(BaseModel):
     key: str
@@ -12,6 +17,17 @@ class CategoryPack(BaseModel):
     includedTypes: List[str] = []
     keywords: List[str] = []
     strategy: Optional[str] = None  # optional hint: nearby | text | hybrid
+    text_query: str = ""  # precomputed " OR ".join(keywords), set at load time
+
+
+# __file__ -> app/utils/categories.py
+# project_root = dirname(dirname(dirname(__file__)))
+_PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(
+        os.path.dirname(os.path.abspath(__file__))
+    )
+)
+DEFAULT_CATEGORIES_PATH = os.path.join(_PROJECT_ROOT, "data", "categories.json")
 
 
 def load_category_packs(path: Optional[str] = None) -> List[CategoryPack]:
@@ -19,21 +35,36 @@ def load_category_packs(path: Optional[str] = None) -> List[CategoryPack]:
     Loads category packs from data/categories.json by default.
     """
     if path is None:
-        # __file__ -> app/utils/categories.py
-        # project_root = dirname(dirname(dirname(__file__)))
-        project_root = os.path.dirname(
-            os.path.dirname(
-                os.path.dirname(os.path.abspath(__file__))
-            )
-        )
-        default_path = os.path.join(project_root, "data", "categories.json")
-        path = default_path
+        path = DEFAULT_CATEGORIES_PATH
 
     if not os.path.exists(path):
         raise FileNotFoundError(f"Category data file not found at {path}")
 
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    if orjson is not None:
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
 
     packs = [CategoryPack(**item) for item in data]
+    for pack in packs:
+        # Normalize once at load: duplicate entries in the JSON would otherwise
+        # inflate every includedTypes request body and keyword query we send
+        pack.includedTypes = list(dict.fromkeys(pack.includedTypes))
+        pack.keywords = list(dict.fromkeys(pack.keywords))
+        pack.text_query = " OR ".join(pack.keywords) if pack.keywords else ""
     return packs
+
+
+def build_type_index(packs: List[CategoryPack]) -> dict:
+    """
+    Reverse includedTypes -> pack index, built once per taxonomy load so
+    per-place categorization is a dict lookup instead of scanning every pack.
+    First pack wins when a type appears in several.
+    """
+    index: dict = {}
+    for pack in packs:
+        for t in pack.includedTypes:
+            index.setdefault(t, pack)
+    return index
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import math
+from typing import Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Optional fast path: Numba fuses the whole haversine loop into one JIT'd pass
+# with no intermediate arrays. The app works without it.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Optional fast path for large candidate sets: a KD-tree ball query touches only
+# the points near the center instead of running trig on all of them
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+EARTH_RADIUS_M = 6371000.0
+
+# Below this many points the per-ufunc overhead of plain NumPy is negligible and
+# JIT dispatch isn't worth it
+FUSED_MIN_POINTS = 256
+
+# Below this many points the O(N log N) tree build costs more than it saves
+KDTREE_MIN_POINTS = 512
+
+if njit is not None:
+
+    @njit(fastmath=True, cache=True)
+    def _haversine_kernel(lats, lngs, center_lat_rad, center_lng_rad, cos_center, radius_m, out_mask, out_dist):
+        deg2rad = math.pi / 180.0
+        for i in range(lats.shape[0]):
+            lat_rad = lats[i] * deg2rad
+            dlat = lat_rad - center_lat_rad
+            dlon = lngs[i] * deg2rad - center_lng_rad
+            a = math.sin(dlat / 2) ** 2 + cos_center * math.cos(lat_rad) * math.sin(dlon / 2) ** 2
+            if a > 1.0:
+                a = 1.0
+            d = 2.0 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+            out_dist[i] = d
+            out_mask[i] = d <= radius_m
+
+
+def fused_radius_mask(lats, lngs, center_lat: float, center_lng: float, radius_m: float) -> Optional[Tuple["np.ndarray", "np.ndarray"]]:
+    """
+    Fused in-radius mask + distances (meters) for float64 coordinate arrays.
+    Returns None when the Numba fast path is unavailable; callers fall back to
+    the NumPy pass. Inputs must be NaN-free (use a far-away sentinel for
+    missing coordinates).
+    """
+    if njit is None or np is None:
+        return None
+    n = lats.shape[0]
+    out_mask = np.zeros(n, dtype=np.bool_)
+    out_dist = np.full(n, np.inf)
+    center_lat_rad = math.radians(center_lat)
+    center_lng_rad = math.radians(center_lng)
+    _haversine_kernel(lats, lngs, center_lat_rad, center_lng_rad, math.cos(center_lat_rad), float(radius_m), out_mask, out_dist)
+    return out_mask, out_dist
+
+
+def numpy_radius_mask(lats, lngs, center_lat: float, center_lng: float, radius_m: float) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Vectorized in-radius mask + distances (meters) for float64 coordinate
+    arrays, with a cheap bounding-box prefilter so only plausible candidates
+    pay for the trig. NaN marks a missing coordinate and is never kept.
+    """
+    n = lats.shape[0]
+    have = ~np.isnan(lats) & ~np.isnan(lngs)
+    # A degree of latitude is ~111.32 km; the box is a tight superset of the disc
+    dlat_max = radius_m / 111320.0
+    dlng_max = radius_m / (111320.0 * max(math.cos(math.radians(center_lat)), 1e-6))
+    with np.errstate(invalid="ignore"):
+        candidate = have & (np.abs(lats - center_lat) <= dlat_max) & (np.abs(lngs - center_lng) <= dlng_max)
+    keep = np.zeros(n, dtype=bool)
+    dists = np.full(n, np.inf)
+    if candidate.any():
+        c_lats = lats[candidate]
+        c_lngs = lngs[candidate]
+        dlat = np.radians(c_lats - center_lat)
+        dlng = np.radians(c_lngs - center_lng)
+        a = np.sin(dlat / 2) ** 2 + np.cos(np.radians(center_lat)) * np.cos(np.radians(c_lats)) * np.sin(dlng / 2) ** 2
+        d = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+        keep[candidate] = d <= radius_m
+        dists[candidate] = d
+    return keep, dists
+
+
+def kdtree_radius_mask(lats, lngs, center_lat: float, center_lng: float, radius_m: float) -> Optional[Tuple["np.ndarray", "np.ndarray"]]:
+    """
+    In-radius mask + distances (meters) via a KD-tree ball query over a local
+    tangent-plane projection of the coordinates. Distances are equirectangular
+    approximations, which is plenty for ordering at the <=50 km radii the API
+    allows. Returns None when SciPy is unavailable; inputs must be NaN-free.
+    """
+    if cKDTree is None or np is None:
+        return None
+    cos_center = math.cos(math.radians(center_lat))
+    x = (lngs - center_lng) * (111320.0 * cos_center)
+    y = (lats - center_lat) * 111320.0
+    tree = cKDTree(np.column_stack((x, y)))
+    idx = tree.query_ball_point((0.0, 0.0), r=float(radius_m))
+    mask = np.zeros(lats.shape[0], dtype=np.bool_)
+    dist = np.full(lats.shape[0], np.inf)
+    if idx:
+        idx = np.asarray(idx, dtype=np.intp)
+        mask[idx] = True
+        dist[idx] = np.hypot(x[idx], y[idx])
+    return mask, dist
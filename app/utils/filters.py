@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from typing import List
 
 from app.models.schemas import PlaceLite
@@ -7,18 +8,20 @@ from app.models.schemas import PlaceLite
 # Generic-only type tags commonly present; indicate weak categorization
 GENERIC_TYPES = {"point_of_interest", "establishment"}
 
+# Precompiled heuristics so each address is scanned once, without the
+# per-call .lower() allocation
+_RESIDENTIAL_RE = re.compile(r"\b(?:apt|apartment|unit|suite\s*#|lot)\b", re.I)
+_DIGIT_RE = re.compile(r"\d")
+
 
 def _looks_residential_address(addr: str | None) -> bool:
     if not addr:
         return False
-    a = addr.lower()
     # Very light heuristics: apartment/unit indicators or lack of commas (single-line)
-    if any(token in a for token in ["apt", "apartment", "unit", "suite #", "lot "]):
+    if _RESIDENTIAL_RE.search(addr):
         return True
     # If no comma at all, often a weak single-line address or POI label
-    if "," not in a and any(ch.isdigit() for ch in a):
-        return True
-    return False
+    return "," not in addr and bool(_DIGIT_RE.search(addr))
 
 
 def apply_residential_filter(results: List[PlaceLite], exclude_service_area_only: bool = True) -> List[PlaceLite]:
@@ -33,9 +36,8 @@ def apply_residential_filter(results: List[PlaceLite], exclude_service_area_only
 
         # Safety net heuristics: only generic tags AND 0 reviews AND residential-looking address
         types_set = set(r.types or [])
-        non_generic_types = [t for t in types_set if t not in GENERIC_TYPES]
 
-        if not non_generic_types:
+        if not (types_set - GENERIC_TYPES):
             # No clear trade type present
             rating_zero = (r.userRatingCount or 0) == 0
             if rating_zero and _looks_residential_address(r.formattedAddress):